@@ -5,34 +5,287 @@ Backend with parallel processing and background monitoring
 """
 
 from flask import Flask, render_template, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 import yaml
 import subprocess
 import platform
 import time
 import threading
+import asyncio
+import socket
+import struct
+import os
+import pickle
+import re
+import shutil
 from datetime import datetime
-from typing import Dict, List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count, repeat
 import logging
 from flask_cors import CORS # Import CORS
 
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml C parser
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, responses are encoded straight to bytes"""
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=self.default), mimetype=self.mimetype)
+
 app = Flask(__name__)
+if orjson:
+    app.json = ORJSONProvider(app)
 CORS(app) # Enable CORS for all routes
 
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+ICMP_PAYLOAD = b'ping-monitor'
+
+# Platform is fixed for the lifetime of the process, so detect it once
+IS_WINDOWS = platform.system() == 'Windows'
+
+if IS_WINDOWS:
+    PING_ARGV_PREFIX = ['ping', '-n', '1', '-w', '3000']  # 3 second timeout
+else:
+    PING_ARGV_PREFIX = ['ping', '-c', '1', '-W', '3']    # 3 second timeout
+
+_LINUX_LATENCY_RE = re.compile(rb'time=(\d+(?:\.\d+)?)')  # "time=XX.X ms" (Linux/macOS)
+_WINDOWS_LATENCY_RE = re.compile(rb'time[=<](\d+(?:\.\d+)?)', re.IGNORECASE)  # "time=XXms" or "time<1ms"
+
+FPING_ARGS = ['-C', '1', '-t', '3000', '-q']  # One echo per host, 3 second timeout, summary only
+FPING_TIMEOUT = 30  # Seconds, one background interval
+_FPING_RE = re.compile(rb'^(\S+)\s+:\s+(\d+(?:\.\d+)?)\s*$', re.MULTILINE)  # "10.0.0.1 : 0.42"
+
+KNOWN_OFFLINE_PING_INTERVAL = 10  # Background cycles between pings of known_offline hosts
+TRIGGER_POLL_INTERVAL = 1  # Seconds between checks for check requests from other workers
+
+CONFIG_CACHE_VERSION = 2  # Bump when the cached tuple layout changes
+
+def _parse_latency_linux(output: bytes) -> Optional[float]:
+    """Parse latency from raw Linux/macOS ping output"""
+    match = _LINUX_LATENCY_RE.search(output)
+    return float(match.group(1)) if match else None
+
+def _parse_latency_windows(output: bytes) -> Optional[float]:
+    """Parse latency from raw Windows ping output ("time<1ms" is reported as 1.0)"""
+    match = _WINDOWS_LATENCY_RE.search(output)
+    return float(match.group(1)) if match else None
+
+_parse_latency = _parse_latency_windows if IS_WINDOWS else _parse_latency_linux
+
+def _icmp_checksum(data: bytes) -> int:
+    """Compute the RFC 1071 internet checksum of an ICMP packet"""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+class _EchoSweep:
+    """Collect ICMP echo replies for a single AsyncPinger sweep"""
+    def __init__(self, sock: socket.socket, ident: int, seq: int, check_ident: bool):
+        self.sock = sock
+        self.ident = ident
+        self.seq = seq
+        self.check_ident = check_ident
+        self.pending = {}  # address -> send time
+        self.latencies = {}  # address -> latency in ms
+        self.done = asyncio.get_running_loop().create_future()
+
+    def on_readable(self):
+        """Drain every reply queued on the socket"""
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(1024)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                logger.debug("ICMP socket error: %s", e)
+                return
+            self._handle_reply(data, addr[0], time.perf_counter())
+
+    def _handle_reply(self, data: bytes, address: str, received_at: float):
+        # Raw sockets (and datagram sockets on macOS) also deliver the IP header
+        if data and data[0] >> 4 == 4:
+            data = data[(data[0] & 0x0F) * 4:]
+        if len(data) < 8:
+            return
+
+        icmp_type, _, _, ident, seq = struct.unpack('!BBHHH', data[:8])
+        if icmp_type != ICMP_ECHO_REPLY or seq != self.seq:
+            return
+        # Linux rewrites the identifier of unprivileged datagram sockets, so only raw sockets can check it
+        if self.check_ident and ident != self.ident:
+            return
+
+        sent_at = self.pending.pop(address, None)
+        if sent_at is None:
+            return
+        self.latencies[address] = round((received_at - sent_at) * 1000, 3)
+        if not self.pending and not self.done.done():
+            self.done.set_result(None)
+
+class AsyncPinger:
+    """Ping many hosts at once over a single ICMP socket using asyncio"""
+    def __init__(self, timeout: float = 3.0):
+        if IS_WINDOWS:
+            raise OSError("ICMP sockets are not supported on Windows")
+        self.timeout = timeout
+        self.ident = os.getpid() & 0xFFFF
+        self._seq = count(1)  # next() is atomic, so concurrent sweeps never share a sequence number
+        self.sock_type = self._probe_socket_type()
+
+    @staticmethod
+    def _probe_socket_type() -> int:
+        """Return the first ICMP socket type this process is allowed to open"""
+        error = None
+        # Prefer unprivileged ping sockets, raw sockets need root or CAP_NET_RAW
+        for sock_type in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+            try:
+                socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP).close()
+                return sock_type
+            except OSError as e:
+                error = e
+        raise error
+
+    def _build_packet(self, seq: int) -> bytes:
+        """Build an ICMP echo request with sequence number seq"""
+        header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, self.ident, seq)
+        checksum = _icmp_checksum(header + ICMP_PAYLOAD)
+        return struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, checksum, self.ident, seq) + ICMP_PAYLOAD
+
+    async def _resolve(self, host: str) -> Optional[str]:
+        """Resolve host to an IPv4 address, None if it has none"""
+        try:
+            socket.inet_pton(socket.AF_INET, host)
+            return host
+        except OSError:
+            pass
+
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await asyncio.wait_for(
+                loop.getaddrinfo(host, None, family=socket.AF_INET, type=socket.SOCK_DGRAM),
+                timeout=self.timeout
+            )
+            return infos[0][4][0]
+        except (OSError, asyncio.TimeoutError) as e:
+            logger.debug("Could not resolve %s: %s", host, e)
+            return None
+
+    async def ping_all(self, hosts: List[str]) -> Dict[str, Optional[float]]:
+        """Send one echo request to every host and return latency in ms (None if no reply)
+
+        Hosts without an IPv4 address (IPv6 literals, AAAA-only names) are left out for the caller to ping.
+        """
+        addresses = await asyncio.gather(*(self._resolve(host) for host in hosts))
+        latencies = {}
+        address_hosts = {}  # address -> hosts resolving to it
+        for host, address in zip(hosts, addresses):
+            if address:
+                latencies[host] = None
+                address_hosts.setdefault(address, []).append(host)
+        if not address_hosts:
+            return latencies
+
+        # Local copy, other threads (background sweep, /api/ping/<host>) share this pinger
+        seq = next(self._seq) & 0xFFFF
+        packet = self._build_packet(seq)
+
+        loop = asyncio.get_running_loop()
+        with socket.socket(socket.AF_INET, self.sock_type, socket.IPPROTO_ICMP) as sock:
+            sock.setblocking(False)
+            sweep = _EchoSweep(sock, self.ident, seq, self.sock_type == socket.SOCK_RAW)
+            loop.add_reader(sock.fileno(), sweep.on_readable)
+            try:
+                # Fire every request before waiting on any reply
+                for address in address_hosts:
+                    sweep.pending[address] = time.perf_counter()
+                    try:
+                        sock.sendto(packet, (address, 0))
+                    except OSError as e:
+                        logger.debug("Could not send echo request to %s: %s", address, e)
+                        del sweep.pending[address]
+
+                if sweep.pending:
+                    try:
+                        await asyncio.wait_for(sweep.done, timeout=self.timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                loop.remove_reader(sock.fileno())
+
+        for address, latency in sweep.latencies.items():
+            for host in address_hosts[address]:
+                latencies[host] = latency
+        return latencies
+
 class PingMonitor:
     def __init__(self, hosts_file='hosts.yaml'):
         self.hosts_file = hosts_file
+        self.cache_file = hosts_file + '.pkl'  # Parsed config cache, keyed on the YAML mtime
+        self._config_key = None  # (mtime_ns, size) of hosts_file when it was last loaded
+        # Under multi-process servers only the process holding lock_file pings, the others read results_file
+        self.lock_file = hosts_file + '.lock'
+        self.results_file = hosts_file + '.results.pkl'
+        # Touched by the other processes when they start and when they request a check
+        self.trigger_file = hosts_file + '.trigger'
+        self.is_leader = False
+        self._leader_lock = None
+        self._shared_results_mtime = None
+        self._trigger_mtime = None
+        self._share_results = False  # Set once another process exists, until then results_file is not written
+        self._shared_written = None  # (checks_completed, results) last written to results_file
+        self._share_lock = threading.Lock()  # Serializes writers of results_file
+        # Host metadata and results are parallel arrays indexed by host position
         self.hosts = []
-        self.host_info = {}  # Store host metadata (type, color, known_offline)
-        self.results = {}
+        self.host_index = {}  # host -> index into the arrays below
+        self.types = []
+        self.colors = []
+        self.known_offline = []
+        self.results = {}  # host -> result, replaced wholesale and never mutated once published
+        self.generation = 0  # Bumped whenever the host arrays are replaced
+        # Requested (manual) checks numbered from 1, clients poll checks_completed to see theirs finish
+        self.checks_started = 0
+        self.checks_completed = 0
+        self.active_indices = []  # Indices of hosts not marked known_offline
+        self._templates = []  # Per-host result dict with metadata prefilled, copied for each ping
         self.config = {}
         self.is_running = False
         self.background_thread = None
-        self.lock = threading.Lock()  # Thread safety for results
+        self._wake = threading.Event()  # Set to start the next background sweep immediately
+        self.lock = threading.Lock()  # Serializes writers of results, readers take a snapshot without it
+        self.pinger = self._create_pinger()
+        # Batch all hosts through a single fping process when ICMP sockets are unavailable
+        self.fping = None if self.pinger else shutil.which('fping')
+        # Reused by every subprocess sweep (max 30 concurrent pings), threads start on first use
+        self._executor = ThreadPoolExecutor(max_workers=30, thread_name_prefix='ping')
+        self._parse_latency = _parse_latency  # Parser specialized for this platform
         
         # Load configuration
         self.load_config()
@@ -41,26 +294,33 @@ class PingMonitor:
         self.start_background_monitoring()
         
     def load_config(self):
-        """Load hosts and configuration from YAML file"""
+        """Load hosts and configuration from YAML file (or its pickle cache)"""
+        self._config_key = self._hosts_file_key()  # Taken first, so an edit during loading is seen later
         try:
+            cached = self._load_config_cache()
+            if cached:
+                hosts, types, colors, offline_flags, self.config = cached
+                self._set_hosts(hosts, types, colors, offline_flags)
+                logger.info("Total loaded %d hosts from %s", len(self.hosts), self.cache_file)
+                return
+            
             with open(self.hosts_file, 'r') as f:
-                data = yaml.safe_load(f)
-                logger.info(f"Raw YAML data: {data}")
+                data = yaml.load(f, Loader=SafeLoader)
+                logger.debug("Raw YAML data: %s", data)
                 
                 if data is None:
                     logger.error("YAML file is empty or contains only comments")
-                    self.hosts = []
+                    self._set_hosts([], [], [], [])
                     return
                     
                 if not isinstance(data, dict):
-                    logger.error(f"YAML data is not a dictionary, got: {type(data)}")
-                    self.hosts = []
+                    logger.error("YAML data is not a dictionary, got: %s", type(data))
+                    self._set_hosts([], [], [], [])
                     return
                 
                 # Parse hosts - support both old and new format
                 hosts_data = data.get('hosts', [])
-                self.hosts = []
-                self.host_info = {}
+                hosts, types, colors, offline_flags = [], [], [], []
                 
                 if hosts_data and isinstance(hosts_data[0], dict) and 'type' in hosts_data[0]:
                     # New format with tags and support known_offline
@@ -85,13 +345,11 @@ class PingMonitor:
                                     known_offline = ip_details.get('known_offline', False)
                             
                             if ip: # Only add if IP was successfully extracted
-                                self.hosts.append(ip)
-                                self.host_info[ip] = {
-                                    'type': group_type,
-                                    'color': group_color,
-                                    'known_offline': known_offline
-                                }
-                        logger.info(f"Loaded {len(group_ips_entries)} hosts for type '{group_type}'")
+                                hosts.append(ip)
+                                types.append(group_type)
+                                colors.append(group_color)
+                                offline_flags.append(known_offline)
+                        logger.info("Loaded %d hosts for type '%s'", len(group_ips_entries), group_type)
                 else:
                     # Old format - simple list (also supports mixed, where some ips are dicts)
                     for host_item in hosts_data:
@@ -109,58 +367,318 @@ class PingMonitor:
                                 known_offline = ip_details.get('known_offline', False)
                                 
                         if ip:
-                            self.hosts.append(ip)
-                            self.host_info[ip] = {
-                                'type': 'Unknown', # Default type for old/mixed format if not specified
-                                'color': '#6c757d', # Default color
-                                'known_offline': known_offline
-                            }
+                            hosts.append(ip)
+                            types.append('Unknown') # Default type for old/mixed format if not specified
+                            colors.append('#6c757d') # Default color
+                            offline_flags.append(known_offline)
                 
                 self.config = data.get('config', {})
-                logger.info(f"Total loaded {len(self.hosts)} hosts from {self.hosts_file}")
+                self._set_hosts(hosts, types, colors, offline_flags)
+                logger.info("Total loaded %d hosts from %s", len(self.hosts), self.hosts_file)
                 
-                # Initialize results with unknown status
-                with self.lock:
-                    for host in self.hosts:
-                        if host not in self.results:
-                            self.results[host] = {
-                                'status': 'unknown',
-                                'latency': None,
-                                'timestamp': None,
-                                'type': self.host_info[host]['type'],
-                                'color': self.host_info[host]['color'],
-                                'known_offline': self.host_info[host]['known_offline']
-                            }
+                self._save_config_cache()
                 
         except FileNotFoundError:
-            logger.error(f"Configuration file {self.hosts_file} not found")
-            self.hosts = []
+            logger.error("Configuration file %s not found", self.hosts_file)
+            self._set_hosts([], [], [], [])
         except yaml.YAMLError as e:
-            logger.error(f"Error parsing YAML file: {e}")
-            self.hosts = []
+            logger.error("Error parsing YAML file: %s", e)
+            self._set_hosts([], [], [], [])
         except Exception as e:
-            logger.error(f"Error loading hosts file: {e}")
-            self.hosts = []
+            logger.error("Error loading hosts file: %s", e)
+            self._set_hosts([], [], [], [])
     
-    def ping_host(self, host: str) -> Dict:
-        """Ping a single host and return result"""
-        system = platform.system().lower()
+    def _hosts_file_key(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of hosts_file, the same key as the config cache, None if it is missing"""
+        try:
+            stat = os.stat(self.hosts_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload_if_changed(self) -> bool:
+        """Reload the configuration if hosts_file changed since it was loaded, True if it did"""
+        if self._hosts_file_key() == self._config_key:
+            return False
+        logger.info("%s changed, reloading", self.hosts_file)
+        self.load_config()
+        return True
+    
+    def _set_hosts(self, hosts: List[str], types: List[str], colors: List[str], offline_flags: List[bool]):
+        """Replace the host arrays, keeping existing results for hosts that are still configured"""
+        with self.lock:
+            results = {}
+            templates = []
+            for host, host_type, color, known_offline in zip(hosts, types, colors, offline_flags):
+                # Initialize results with unknown status
+                template = {
+                    'status': 'unknown',
+                    'latency': None,
+                    'timestamp': None,
+                    'type': host_type,
+                    'color': color,
+                    'known_offline': known_offline,
+                    'show_known_tag': False,
+                    'show_unknown_tag': False
+                }
+                templates.append(template)
+                
+                # Keep the last status of hosts that are still configured
+                result = template.copy()
+                old_result = self.results.get(host)
+                if old_result:
+                    result['status'] = old_result['status']
+                    result['latency'] = old_result['latency']
+                    result['timestamp'] = old_result['timestamp']
+                    # Show 'known' tag for offline known_offline hosts, 'unknown' tag for other offline hosts
+                    is_offline = result['status'] == 'red'
+                    result['show_known_tag'] = is_offline and known_offline
+                    result['show_unknown_tag'] = is_offline and not known_offline
+                results[host] = result
+            
+            self.generation += 1
+            self.hosts = hosts
+            self.host_index = {host: idx for idx, host in enumerate(hosts)}
+            self.types = types
+            self.colors = colors
+            self.known_offline = offline_flags
+            self.results = results
+            self._templates = templates
+            self.active_indices = [idx for idx, known_offline in enumerate(offline_flags) if not known_offline]
+    
+    def _load_config_cache(self) -> Optional[tuple]:
+        """Load parsed config from the pickle cache if it matches the current YAML file"""
+        try:
+            stat = os.stat(self.hosts_file)
+            with open(self.cache_file, 'rb') as f:
+                version, mtime_ns, size, *config = pickle.load(f)
+        except OSError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable config cache %s: %s", self.cache_file, e)
+            return None
         
-        # Get known_offline status from host_info
-        known_offline_flag = self.host_info.get(host, {}).get('known_offline', False)
+        if version != CONFIG_CACHE_VERSION or mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+            return None
         
+        return tuple(config)
+    
+    def _save_config_cache(self):
+        """Write parsed config to the pickle cache, keyed on the YAML file mtime"""
         try:
-            if system == 'windows':
-                cmd = ['ping', '-n', '1', '-w', '3000', host]  # 3 second timeout
-            else:
-                cmd = ['ping', '-c', '1', '-W', '3', host]    # 3 second timeout
-            
-            start_time = time.time()
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            stat = os.stat(self.hosts_file)
+            tmp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(
+                    (CONFIG_CACHE_VERSION, stat.st_mtime_ns, stat.st_size,
+                     self.hosts, self.types, self.colors, self.known_offline, self.config),
+                    f, protocol=5
+                )
+            os.replace(tmp_file, self.cache_file)  # Atomic so readers never see a partial cache
+        except OSError as e:
+            logger.debug("Could not write config cache %s: %s", self.cache_file, e)
+    
+    def _create_pinger(self) -> Optional[AsyncPinger]:
+        """Create the ICMP socket pinger, None if ICMP sockets are not permitted"""
+        try:
+            return AsyncPinger()
+        except OSError as e:
+            logger.warning("ICMP sockets unavailable (%s), falling back to ping subprocesses", e)
+            return None
+
+    def _make_result(self, template: Dict, status: str, latency: Optional[float], timestamp: str) -> Dict:
+        """Build a new result dict from a host's template, including its metadata and tags"""
+        # Shallow copy of the prebuilt template instead of assembling all eight keys per ping
+        result = template.copy()
+        result['status'] = status
+        result['latency'] = latency
+        result['timestamp'] = timestamp
+        if status == 'red':
+            known_offline = result['known_offline']
+            result['show_known_tag'] = known_offline
+            result['show_unknown_tag'] = not known_offline
+        return result
+
+    def _make_latency_result(self, template: Dict, latency: Optional[float], timestamp: str) -> Dict:
+        """Build a result from a batch ping latency (None means no reply)"""
+        if latency is None:
+            return self._make_result(template, 'red', None, timestamp)
+        return self._make_result(template, 'green' if latency <= 50 else 'yellow', latency, timestamp)
+
+    def host_snapshot(self, host: str) -> Optional[Tuple[int, Dict]]:
+        """Return (generation, template) for host taken together, None if it is not configured"""
+        with self.lock:
+            idx = self.host_index.get(host)
+            if idx is None:
+                return None
+            return self.generation, self._templates[idx]
+
+    def update_results(self, new_results: Dict[str, Dict], generation: int, check: Optional[int] = None):
+        """Publish new_results with one reference swap, dropping results pinged before a reload
+
+        check is the number of the requested check these results complete, if any.
+        """
+        with self.lock:
+            if check is not None:
+                self.checks_completed = check
+            if generation == self.generation:
+                results = dict(self.results)
+                results.update(new_results)
+                self.results = results  # Atomic reference swap, readers never see a partial update
+        if self.is_leader and self._share_results:
+            self._save_shared_results()
+
+    def _try_become_leader(self) -> bool:
+        """Take the process-wide monitor lock, True if this process should run the pings"""
+        if fcntl is None:
+            self.is_leader = True  # No flock, assume a single process
+            return True
+        try:
+            lock = open(self.lock_file, 'a')
+        except OSError as e:
+            logger.warning("Cannot open monitor lock %s (%s), assuming a single process", self.lock_file, e)
+            self.is_leader = True
+            return True
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            return False
+        self._leader_lock = lock  # Held until the process exits
+        self.is_leader = True
+        return True
+
+    def _save_shared_results(self):
+        """Write the latest results for the other worker processes"""
+        with self._share_lock:
+            # Latest, so a slower writer never overwrites newer results
+            checks_completed, results = self.checks_completed, self.results
+            if self._shared_written and self._shared_written[0] == checks_completed and self._shared_written[1] is results:
+                return
+            try:
+                tmp_file = f"{self.results_file}.{os.getpid()}.tmp"
+                with open(tmp_file, 'wb') as f:
+                    pickle.dump((checks_completed, results), f, protocol=5)
+                os.replace(tmp_file, self.results_file)  # Atomic so readers never see a partial file
+            except OSError as e:
+                logger.debug("Could not write shared results %s: %s", self.results_file, e)
+                return
+            self._shared_written = (checks_completed, results)
+
+    def _touch_trigger(self):
+        """Ask the leader process to share its results and run a check"""
+        try:
+            with open(self.trigger_file, 'a'):
+                pass
+            os.utime(self.trigger_file)
+        except OSError as e:
+            logger.warning("Could not signal the monitoring process through %s: %s", self.trigger_file, e)
+
+    def _trigger_file_mtime(self) -> Optional[int]:
+        """mtime_ns of trigger_file, None if it is missing"""
+        try:
+            return os.stat(self.trigger_file).st_mtime_ns
+        except OSError:
+            return None
+
+    def _check_trigger(self) -> bool:
+        """True if another process touched trigger_file since the last check"""
+        mtime = self._trigger_file_mtime()
+        if mtime is None or mtime == self._trigger_mtime:
+            return False
+        self._trigger_mtime = mtime
+        self._share_results = True  # Another process is running, keep results_file up to date from now on
+        return True
+
+    def _wait_for_request(self, timeout: float) -> bool:
+        """Sleep up to timeout seconds, True if a check was requested by this or another process"""
+        deadline = time.monotonic() + timeout
+        while self.is_running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if self._wake.wait(timeout=min(remaining, TRIGGER_POLL_INTERVAL)):
+                self._wake.clear()
+                return True
+            # Checked here as well as by followers, a reload through another process only changes that one
+            if self._check_trigger() or self.reload_if_changed():
+                return True
+        return False
+
+    def _load_shared_results(self):
+        """Pick up results written by the leader process if they changed"""
+        try:
+            mtime = os.stat(self.results_file).st_mtime_ns
+            if mtime == self._shared_results_mtime:
+                return
+            with open(self.results_file, 'rb') as f:
+                checks_completed, results = pickle.load(f)
+        except Exception as e:
+            logger.debug("Could not read shared results %s: %s", self.results_file, e)
+            return
+        with self.lock:
+            self.checks_completed = checks_completed
+            self.results = results
+            self._shared_results_mtime = mtime
+
+    def _batch_ping(self, hosts: List[str]) -> Optional[Dict[str, Optional[float]]]:
+        """Ping hosts over one ICMP socket or one fping process, None if neither is usable
+
+        Hosts missing from the returned dict could not be pinged this way.
+        """
+        if self.pinger:
+            try:
+                return asyncio.run(self.pinger.ping_all(hosts))
+            except OSError as e:
+                logger.error("ICMP ping sweep failed: %s", e)
+                return None
+        if self.fping:
+            return self._fping_all(hosts)
+        return None
+
+    def _fping_all(self, hosts: List[str]) -> Optional[Dict[str, Optional[float]]]:
+        """Ping hosts with a single fping process, None if fping could not run"""
+        try:
+            proc = subprocess.run(
+                [self.fping] + FPING_ARGS + hosts,
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=FPING_TIMEOUT
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.error("fping sweep failed: %s", e)
+            return None
+        
+        # Exit status 1 means some hosts were unreachable and 2 that some were not found
+        if proc.returncode > 2:
+            logger.error("fping exited with status %d: %s", proc.returncode, proc.stderr.decode(errors='replace').strip())
+            return None
+        
+        latencies = dict.fromkeys(hosts)
+        for match in _FPING_RE.finditer(proc.stderr):
+            latencies[match.group(1).decode()] = float(match.group(2))
+        return latencies
+
+    def ping_host(self, host: str, template: Dict, timestamp: str) -> Dict:
+        """Ping host and return a new result built from its template"""
+        latencies = self._batch_ping([host])
+        if latencies is not None and host in latencies:
+            return self._make_latency_result(template, latencies[host], timestamp)
+        return self._ping_subprocess(host, template, timestamp)
+    
+    def _ping_subprocess(self, host: str, template: Dict, timestamp: str) -> Dict:
+        """Ping host with a ping subprocess and return a new result built from its template"""
+        try:
+            with subprocess.Popen(PING_ARGV_PREFIX + [host], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as proc:
+                try:
+                    returncode = proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    raise
+                # ping output is a few hundred bytes, far below the pipe buffer, so waiting first cannot deadlock
+                output = proc.stdout.read(1024)
             
-            if result.returncode == 0:
+            if returncode == 0:
                 # Parse latency from output
-                latency = self._parse_latency(result.stdout, system)
+                latency = self._parse_latency(output)
                 
                 # Determine status based on latency
                 if latency is not None and latency <= 50:
@@ -170,124 +688,102 @@ class PingMonitor:
                 else:
                     status = 'green'  # Default if we can't parse latency but ping succeeded
                 
-                return {
-                    'status': status,
-                    'latency': latency,
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'type': self.host_info.get(host, {}).get('type', 'Unknown'),
-                    'color': self.host_info.get(host, {}).get('color', '#6c757d'),
-                    'known_offline': known_offline_flag # Include known_offline in results
-                }
+                return self._make_result(template, status, latency, timestamp)
             else:
-                return {
-                    'status': 'red',
-                    'latency': None,
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'type': self.host_info.get(host, {}).get('type', 'Unknown'),
-                    'color': self.host_info.get(host, {}).get('color', '#6c757d'),
-                    'known_offline': known_offline_flag # Include known_offline in results
-                }
+                return self._make_result(template, 'red', None, timestamp)
                 
         except subprocess.TimeoutExpired:
-            return {
-                'status': 'red',
-                'latency': None,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'type': self.host_info.get(host, {}).get('type', 'Unknown'),
-                'color': self.host_info.get(host, {}).get('color', '#6c757d'),
-                'known_offline': known_offline_flag # Include known_offline in results
-            }
+            return self._make_result(template, 'red', None, timestamp)
         except Exception as e:
-            logger.debug(f"Error pinging {host}: {e}")
-            return {
-                'status': 'red',
-                'latency': None,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'type': self.host_info.get(host, {}).get('type', 'Unknown'),
-                'color': self.host_info.get(host, {}).get('color', '#6c757d'),
-                'known_offline': known_offline_flag # Include known_offline in results
-            }
+            logger.debug("Error pinging %s: %s", host, e)
+            return self._make_result(template, 'red', None, timestamp)
     
-    def _parse_latency(self, output: str, system: str) -> Optional[float]:
-        """Parse latency from ping output"""
+    def _ping_with_host(self, host: str, template: Dict, timestamp: str) -> Tuple[str, Dict]:
+        """Ping host with a subprocess and return (host, result), never raises"""
         try:
-            output_lower = output.lower()
-            
-            if system == 'windows':
-                # Look for "time=XXXms" or "time<1ms"
-                lines = output_lower.split('\n')
-                for line in lines:
-                    if 'time=' in line:
-                        time_part = line.split('time=')[1].split()[0]
-                        if 'ms' in time_part:
-                            return float(time_part.replace('ms', ''))
-                    elif 'time<' in line:
-                        # Handle "time<1ms"
-                        return 1.0
-            else:
-                # Linux/macOS: look for "time=XX.X ms"
-                lines = output_lower.split('\n')
-                for line in lines:
-                    if 'time=' in line:
-                        time_part = line.split('time=')[1].split()[0]
-                        return float(time_part)
-        except (IndexError, ValueError) as e:
-            logger.debug(f"Could not parse latency from output: {e}")
-        
-        return None
+            result = self._ping_subprocess(host, template, timestamp)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s: %s (%sms)", host, result['status'], result['latency'])
+        except Exception as e:
+            logger.error("Error pinging %s: %s", host, e)
+            result = self._make_result(template, 'red', None, timestamp)
+        return host, result
     
-    def ping_all_hosts_parallel(self):
-        """Ping all hosts in parallel using ThreadPoolExecutor"""
-        if not self.hosts:
+    def ping_all_hosts_parallel(self, include_known_offline: bool = True, check: Optional[int] = None):
+        """Ping all hosts in parallel, in one batch over ICMP sockets or fping when available"""
+        # Snapshot hosts and templates together, a reload during the sweep replaces the live arrays
+        with self.lock:
+            generation = self.generation
+            indices = range(len(self.hosts)) if include_known_offline else self.active_indices
+            hosts = [self.hosts[idx] for idx in indices]
+            templates = [self._templates[idx] for idx in indices]
+        if not hosts:
+            self.update_results({}, generation, check)
             return
         
-        max_workers = min(30, len(self.hosts))  # Limit concurrent pings
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')  # Shared by every host of this sweep
+        new_results = {}  # Built without locking, published in one swap below
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all ping tasks
-            future_to_host = {executor.submit(self.ping_host, host): host for host in self.hosts}
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_host):
-                host = future_to_host[future]
-                try:
-                    result = future.result()
-                    with self.lock:
-                        self.results[host] = result
-                    logger.debug(f"{host}: {result['status']} ({result['latency']}ms)")
-                except Exception as e:
-                    logger.error(f"Error pinging {host}: {e}")
-                    # Ensure known_offline is still present even on error
-                    known_offline_flag = self.host_info.get(host, {}).get('known_offline', False)
-                    with self.lock:
-                        self.results[host] = {
-                            'status': 'red',
-                            'latency': None,
-                            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                            'type': self.host_info.get(host, {}).get('type', 'Unknown'),
-                            'color': self.host_info.get(host, {}).get('color', '#6c757d'),
-                            'known_offline': known_offline_flag
-                        }
+        latencies = self._batch_ping(hosts) or {}
+        fallback_hosts, fallback_templates = [], []  # Hosts the batch could not ping
+        for host, template in zip(hosts, templates):
+            if host in latencies:
+                new_results[host] = self._make_latency_result(template, latencies[host], timestamp)
+            else:
+                fallback_hosts.append(host)
+                fallback_templates.append(template)
+        
+        if fallback_hosts:
+            # Fallback: one ping subprocess per host using ThreadPoolExecutor
+            results = self._executor.map(self._ping_with_host, fallback_hosts, fallback_templates, repeat(timestamp))
+            for host, result in results:
+                new_results[host] = result
+        
+        self.update_results(new_results, generation, check)
     
     def background_monitor(self):
         """Background thread function that continuously pings hosts"""
+        # Only one process pings, the others wait to take over if the leader exits
+        # Touches left from an earlier run are older than this, so they do not count as other processes
+        self._trigger_mtime = self._trigger_file_mtime()
+        if not self._try_become_leader():
+            logger.info("Another process is monitoring, reading its results from %s", self.results_file)
+            self._touch_trigger()  # Have the leader start writing results_file
+            while self.is_running and not self._try_become_leader():
+                self._wake.wait(timeout=30)
+                self._wake.clear()
+            if not self.is_running:
+                return
+            # Other processes were running alongside the previous leader, keep sharing results with them
+            self._share_results = True
+            self._trigger_mtime = self._trigger_file_mtime()  # Requests before the takeover were for the previous leader
+        
         logger.info("Background monitoring started")
         
         # Initial ping check
         self.ping_all_hosts_parallel()
         logger.info("Initial ping check completed")
         
+        cycle = 0
         while self.is_running:
             try:
-                time.sleep(30)  # Wait 30 seconds
+                requested = self._wait_for_request(30)  # Wait 30 seconds or until a check is requested
                 if self.is_running:  # Check again after sleep
-                    logger.info("Running scheduled ping check...")
+                    logger.info("Running requested ping check..." if requested else "Running scheduled ping check...")
                     start_time = time.time()
-                    self.ping_all_hosts_parallel()
+                    # known_offline hosts are expected to be down, only recheck them occasionally
+                    cycle += 1
+                    check = None
+                    if requested:
+                        self.checks_started += 1
+                        check = self.checks_started
+                    self.ping_all_hosts_parallel(
+                        include_known_offline=requested or cycle % KNOWN_OFFLINE_PING_INTERVAL == 0, check=check
+                    )
                     elapsed = time.time() - start_time
-                    logger.info(f"Ping check completed in {elapsed:.2f} seconds")
+                    logger.info("Ping check completed in %.2f seconds", elapsed)
             except Exception as e:
-                logger.error(f"Error in background monitoring: {e}")
+                logger.error("Error in background monitoring: %s", e)
                 time.sleep(30)  # Wait before retrying
     
     def start_background_monitoring(self):
@@ -301,37 +797,34 @@ class PingMonitor:
     def stop_background_monitoring(self):
         """Stop the background monitoring thread"""
         self.is_running = False
+        self._wake.set()
         if self.background_thread and self.background_thread.is_alive():
             self.background_thread.join(timeout=5)
             logger.info("Background monitoring thread stopped")
+        self._executor.shutdown(wait=False)
     
     def get_results_copy(self):
-        """Get a thread-safe copy of current results"""
-        with self.lock:
-            results_copy = {}
-            for host, result in self.results.items():
-                result_copy = result.copy()
-                
-                is_known_offline_configured = result_copy.get('known_offline', False)
-
-                # Determine if 'known' tag should be shown
-                if result_copy['status'] == 'red' and is_known_offline_configured:
-                    result_copy['show_known_tag'] = True
-                    result_copy['show_unknown_tag'] = False # Ensure only one tag is shown
-                # Determine if 'unknown' tag should be shown (offline but not known_offline)
-                elif result_copy['status'] == 'red' and not is_known_offline_configured:
-                    result_copy['show_known_tag'] = False
-                    result_copy['show_unknown_tag'] = True 
-                else:
-                    result_copy['show_known_tag'] = False
-                    result_copy['show_unknown_tag'] = False
-                results_copy[host] = result_copy
-            return results_copy
+        """Get a snapshot of current results keyed by host"""
+        if not self.is_leader:
+            self.reload_if_changed()
+            self._load_shared_results()
+        # Published results are never mutated, so the current dict is a consistent snapshot without locking
+        return self.results
     
-    def force_ping_all(self):
-        """Force an immediate ping check (for manual triggers)"""
+    def force_ping_all(self) -> int:
+        """Wake the background thread to ping all hosts now (for manual triggers)
+
+        Returns the check number, the check is done once checks_completed reaches it.
+        """
         logger.info("Manual ping check triggered")
-        self.ping_all_hosts_parallel()
+        if self.is_leader:
+            check = self.checks_started + 1  # The next check to start, it pings after this request
+            self._wake.set()
+        else:
+            self._load_shared_results()
+            check = self.checks_completed + 1
+            self._touch_trigger()  # Only the leader pings, signal it through the trigger file
+        return check
 
 # Initialize monitor
 monitor = PingMonitor()
@@ -344,30 +837,34 @@ def index():
 @app.route('/api/hosts')
 def get_hosts():
     """Return list of all hosts with their metadata"""
+    monitor.reload_if_changed()
     hosts_with_info = []
-    for host in monitor.hosts:
+    for host, host_type, color, known_offline in zip(monitor.hosts, monitor.types, monitor.colors, monitor.known_offline):
         host_data = {
             'ip': host,
-            'type': monitor.host_info.get(host, {}).get('type', 'Unknown'),
-            'color': monitor.host_info.get(host, {}).get('color', '#6c757d'),
-            'known_offline': monitor.host_info.get(host, {}).get('known_offline', False) # Include known_offline
+            'type': host_type,
+            'color': color,
+            'known_offline': known_offline # Include known_offline
         }
         hosts_with_info.append(host_data)
     return jsonify(hosts_with_info)
 
 @app.route('/api/ping-all')
 def ping_all():
-    """Force ping all hosts and return results"""
-    monitor.force_ping_all()
-    return jsonify(monitor.get_results_copy())
+    """Trigger a ping of all hosts and return the cached results without waiting for it"""
+    check = monitor.force_ping_all()
+    response = jsonify(monitor.get_results_copy())
+    response.headers['X-Ping-Check'] = str(check)
+    return response
 
 @app.route('/api/ping/<host>')
 def ping_single(host):
     """Ping a single host"""
-    if host in monitor.hosts:
-        result = monitor.ping_host(host)
-        with monitor.lock:
-            monitor.results[host] = result
+    snapshot = monitor.host_snapshot(host)
+    if snapshot is not None:
+        generation, template = snapshot
+        result = monitor.ping_host(host, template, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        monitor.update_results({host: result}, generation)
         return jsonify({host: result})
     else:
         return jsonify({'error': 'Host not found'}), 404
@@ -375,7 +872,9 @@ def ping_single(host):
 @app.route('/api/status')
 def get_status():
     """Get current cached status of all hosts"""
-    return jsonify(monitor.get_results_copy())
+    response = jsonify(monitor.get_results_copy())
+    response.headers['X-Ping-Checks-Completed'] = str(monitor.checks_completed)
+    return response
 
 @app.route('/api/reload')
 def reload_hosts():
@@ -398,8 +897,10 @@ import atexit
 atexit.register(monitor.stop_background_monitoring)
 
 if __name__ == '__main__':
+    from waitress import serve
     try:
-        app.run(host='0.0.0.0', port=30500, debug=False)  # Turn off debug for production
+        # Multi-threaded production WSGI server, so a slow /api/ping/<host> does not stall /api/status
+        serve(app, host='0.0.0.0', port=30500, threads=8)
     except KeyboardInterrupt:
         logger.info("Shutting down...")
         monitor.stop_background_monitoring()